@@ -0,0 +1,63 @@
+"""
+benchmarks/startup.py
+=====================
+
+measures how long it takes to import fcan, and to set up the agents in a
+config until they are bound and serving, starting them sequentially and in
+parallel. agents are bound to free ports, rather than those in the config.
+
+    uv run python benchmarks/startup.py examples/multi-agent/agents.toml
+"""
+
+import sys
+import time
+import argparse
+import subprocess
+import statistics
+
+from pathlib import Path
+
+def time_import(module, runs):
+    timings = []
+    for _ in range(runs):
+        script = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+        output = subprocess.run([sys.executable, "-c", script], capture_output = True, text = True, check = True)
+        timings.append(float(output.stdout) * 1000)
+
+    return statistics.median(timings)
+
+def time_setup(config, runs, parallel):
+    from fcan.cli import start_servers, stop_servers
+    from fcan.config import load_config
+    from fcan.server import A2AServer
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        servers = [A2AServer(**{ **agent, "port": 0 }) for agent in load_config(config)]
+        errors = start_servers(servers, parallel)
+        timings.append((time.perf_counter() - start) * 1000)
+
+        stop_servers(servers)
+        if any(errors):
+            raise Exception(f"Failed to start agents: {errors}")
+
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description = "measures fcan startup time.")
+    parser.add_argument("config", help = "path to the agent config")
+    parser.add_argument("--runs", type = int, default = 10, help = "number of runs to take the median of")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(args.config).resolve().parent))
+
+    print(f"i import fcan:                {time_import("fcan", args.runs):8.2f}ms")
+    print(f"i import fcan.server:         {time_import("fcan.server", args.runs):8.2f}ms")
+    print(f"i import flask (deferred):    {time_import("flask", args.runs):8.2f}ms")
+    print(f"i import ollama (deferred):   {time_import("ollama", args.runs):8.2f}ms")
+    print(f"i start agents sequentially:  {time_setup(args.config, args.runs, False):8.2f}ms")
+    print(f"i start agents in parallel:   {time_setup(args.config, args.runs, True):8.2f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,7 @@
-from operator import mul
-from functools import reduce
-
 from fcan.server import A2AServer
 from fcan.utils import wait_for_servers
 
-def calculate_sum(numbers):
-    return sum(numbers)
-
-def calculate_product(numbers):
-    return reduce(mul, numbers)
-
-def calculate_average(numbers):
-    return sum(numbers) / len(numbers)
+from tools import calculate_sum, calculate_product, calculate_average, fetch_weather
 
 math_skills = [{
     "id": "basic_maths",
@@ -71,15 +61,6 @@ math_functions = [
     }
 ]
 
-def fetch_weather(location):
-    url = f"https://wttr.in/{location}?TF"
-
-    import requests
-    response = requests.get(url)
-    response.raise_for_status()
-
-    return response.text
-
 weather_skills = [{
     "id": "weather",
     "name": "Weather",
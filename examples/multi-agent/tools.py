@@ -0,0 +1,20 @@
+from operator import mul
+from functools import reduce
+
+def calculate_sum(numbers):
+    return sum(numbers)
+
+def calculate_product(numbers):
+    return reduce(mul, numbers)
+
+def calculate_average(numbers):
+    return sum(numbers) / len(numbers)
+
+def fetch_weather(location):
+    url = f"https://wttr.in/{location}?TF"
+
+    import requests
+    response = requests.get(url)
+    response.raise_for_status()
+
+    return response.text
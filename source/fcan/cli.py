@@ -0,0 +1,135 @@
+"""
+fcan/cli.py
+===========
+
+provides the `fcan` command line entry point.
+"""
+
+import sys
+import time
+import signal
+import argparse
+
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from fcan import replay
+from fcan.config import LazyFunction, load_config
+from fcan.server import A2AServer
+from fcan.utils import wait_for_servers
+
+def check_functions(servers):
+    """
+    imports every lazily loaded function, so bad import paths show up now
+    rather than on an agent's first call.
+    """
+
+    failed = False
+    for server in servers:
+        for name, function in server.model_handler.functions.items():
+            if not isinstance(function, LazyFunction):
+                continue
+
+            try:
+                function.resolve()
+            except Exception as error:
+                print(f"! cannot load function {name} ({function.path}): {error!r}")
+                failed = True
+
+    return 1 if failed else 0
+
+def start_servers(servers, parallel = True):
+    """
+    starts the servers (in parallel, by default), returning the error (if any)
+    each one failed to start with.
+    """
+
+    def start(server):
+        try:
+            server.start()
+        except Exception as error:
+            return error
+
+    if not parallel:
+        return [start(server) for server in servers]
+
+    with ThreadPoolExecutor(max_workers = len(servers)) as pool:
+        return list(pool.map(start, servers))
+
+def stop_servers(servers):
+    # shutting a server down waits out its polling interval, so do them all at once.
+    if not servers:
+        return
+
+    with ThreadPoolExecutor(max_workers = len(servers)) as pool:
+        list(pool.map(lambda server: server.stop(), servers))
+
+def serve(args):
+    start = time.perf_counter()
+
+    # functions are imported relative to the config, like a script would.
+    sys.path.insert(0, str(Path(args.config).resolve().parent))
+
+    try:
+        agents = load_config(args.config)
+    except Exception as error:
+        print(f"! cannot load config: {error}")
+        return 1
+
+    if not agents:
+        print("! no agents found in config")
+        return 1
+
+    servers, failed = [], False
+    for agent in agents:
+        try:
+            servers.append(A2AServer(**agent))
+        except Exception as error:
+            print(f"! failed to create agent {agent.get("name")}: {error}")
+            failed = True
+
+    if failed:
+        stop_servers(servers)
+        return 1
+
+    try:
+        errors = start_servers(servers)
+        for server, error in zip(servers, errors):
+            if error:
+                print(f"! failed to start agent at port {server.port}: {error}")
+
+        if any(errors):
+            return 1
+
+        print(f"> started {len(servers)} agents in {(time.perf_counter() - start) * 1000:.1f}ms")
+        if args.check:
+            return check_functions(servers)
+
+        # treat a sigterm like ctrl+c, so the servers below get stopped.
+        signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+        wait_for_servers()
+        return 0
+    finally:
+        stop_servers(servers)
+
+def main(args = None):
+    parser = argparse.ArgumentParser(prog = "fcan")
+    commands = parser.add_subparsers(dest = "command", required = True)
+
+    serve_parser = commands.add_parser("serve", help = "start the agents in a toml or json config")
+    serve_parser.add_argument("config", help = "path to the agent config")
+    serve_parser.add_argument(
+        "--check", action = "store_true",
+        help = "exit once all agents have started and their functions load, instead of serving"
+    )
+    serve_parser.set_defaults(run = serve)
+
+    replay_parser = commands.add_parser("replay", help = "replay recorded logs against the current code")
+    replay.add_arguments(replay_parser)
+    replay_parser.set_defaults(run = replay.run)
+
+    args = parser.parse_args(args)
+    return args.run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+fcan/config.py
+==============
+
+loads declarative agent configs, resolving functions lazily by import path.
+"""
+
+import re
+import json
+import tomllib
+import importlib
+import threading
+
+from pathlib import Path
+
+class LazyFunction:
+    """
+    a function given by its `module:attr` import path, imported on first call.
+    """
+
+    def __init__(self, path):
+        module, _, attr = path.partition(":")
+        if not module or not attr:
+            raise ValueError(f"Invalid function path `{path}`, expected `module:attr`.")
+
+        self.path = path
+        self.function = None
+        self.lock = threading.Lock()
+
+    def resolve(self):
+        with self.lock:
+            if self.function is None:
+                module, _, attr = self.path.partition(":")
+                function = importlib.import_module(module)
+                for name in attr.split("."):
+                    function = getattr(function, name)
+
+                self.function = function
+
+        return self.function
+
+    def __call__(self, *args, **kwargs):
+        return (self.function or self.resolve())(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<lazy function {self.path}>"
+
+def load_config(path):
+    """
+    reads a toml or json agent config, returning the keyword arguments for
+    each agent's `A2AServer`.
+
+    top-level keys other than `agents` are defaults shared by every agent, and
+    each function's `function` is a `module:attr` import path, resolved lazily.
+    relative `record` paths are resolved against the config's directory, and a
+    top-level `record` gets each agent's name added to it (`calls.jsonl` becomes
+    `calls-weather-agent.jsonl`), so every agent records to its own log.
+    """
+
+    path = Path(path)
+    with open(path, "rb") as file:
+        if path.suffix == ".toml":
+            config = tomllib.load(file)
+        else:
+            config = json.load(file)
+
+    defaults = { key: value for key, value in config.items() if key != "agents" }
+    agents = []
+
+    for agent in config.get("agents", []):
+        shared_record = "record" in defaults and "record" not in agent
+        agent = { **defaults, **agent }
+        agent["skills"] = agent.get("skills", [])
+        specs, agent["functions"] = agent.get("functions", []), []
+        for spec in specs:
+            if not spec.get("function"):
+                raise ValueError(f"Function `{spec.get("name")}` of {agent.get("name")} has no import path.")
+
+            agent["functions"].append({ **spec, "function": LazyFunction(spec["function"]) })
+
+        if agent.get("record"):
+            record = path.parent / agent["record"]
+            if shared_record:
+                name = re.sub(r"[^a-z0-9]+", "-", agent["name"].lower()).strip("-")
+                stem, dot, suffixes = record.name.partition(".")
+                record = record.with_name(f"{stem}-{name}{dot}{suffixes}")
+
+            agent["record"] = str(record)
+
+        agents.append(agent)
+
+    return agents
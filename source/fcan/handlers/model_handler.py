@@ -10,7 +10,7 @@ import json
 
 from textwrap import dedent
 from datetime import datetime, timezone
-from ollama import Client
+from functools import cached_property
 
 from fcan.handlers import TaskHandler
 
@@ -24,13 +24,14 @@ class ModelHandler:
         name, description, model,
         skills, functions,
         ollama_url, endpoint,
-        version = "0.1.0"
+        version = "0.1.0", recorder = None
     ):
         specs, calls = self.load_functions(functions)
         self.functions = calls
+        self.recorder = recorder
 
         self.model = model
-        self.llm = Client(host = ollama_url)
+        self.ollama_url = ollama_url
         self.prompt = {
             "content": dedent(f"""\
                 You are {name}, an agent designed to complete tasks using your skills and function-calling
@@ -106,6 +107,15 @@ class ModelHandler:
 
         self.task_handler = TaskHandler()
 
+        if self.recorder:
+            self.recorder.agent(self.agent_card, model, specs)
+
+    @cached_property
+    def llm(self):
+        # ollama is imported on first use, to keep `import fcan` cheap.
+        from ollama import Client
+        return Client(host = self.ollama_url)
+
     def load_functions(self, functions):
         specs, calls = [], {}
         for func in functions:
@@ -116,6 +126,30 @@ class ModelHandler:
         return specs, calls
 
     def process_request(self, rpc):
+        if not self.recorder:
+            return self.handle_request(rpc)
+
+        return self.recorder.record("rpc", rpc, lambda: self.handle_request(rpc))
+
+    def chat(self, messages):
+        def call():
+            return self.llm.chat(model = self.model, messages = messages)
+
+        if not self.recorder:
+            return call()
+
+        return self.recorder.record("chat", { "model": self.model, "messages": messages }, call)
+
+    def call_function(self, name, arguments):
+        def call():
+            return self.functions[name](**arguments)
+
+        if not self.recorder:
+            return call()
+
+        return self.recorder.record("function", { "name": name, "arguments": arguments }, call)
+
+    def handle_request(self, rpc):
         rpc_version = rpc.get("jsonrpc")
         request_id = rpc.get("id")
 
@@ -180,7 +214,7 @@ class ModelHandler:
             return task
 
         conversation = self.task_handler.get_conversation_for_task(task_id)
-        response = self.llm.chat(model = self.model, messages = [
+        response = self.chat([
             self.prompt, *self.task_handler.get_llm_history_for_task(task_id)
         ])
 
@@ -228,7 +262,7 @@ class ModelHandler:
 
         if call.get("function") is not None:
             print(f"i calling function {call["function"]}")
-            output = self.functions[call["function"]](**call["arguments"])
+            output = self.call_function(call["function"], call["arguments"])
 
             self.task_handler.store_message(task_id, {
                 "role": "tool",
@@ -0,0 +1,194 @@
+"""
+fcan/recorder.py
+================
+
+records llm exchanges, function calls and rpcs to an append-only jsonl log.
+"""
+
+import io
+import json
+import time
+import threading
+import itertools
+
+from pathlib import Path
+from datetime import datetime, timezone
+from ulid import ULID
+
+def open_log(path, mode):
+    """
+    opens a log file in text mode, transparently (de)compressing it with zstd
+    if the path ends in `.zst`.
+    """
+
+    path = str(path)
+    if not path.endswith(".zst"):
+        return open(path, mode, encoding = "utf-8")
+
+    try:
+        from compression import zstd
+        return zstd.open(path, mode + "t", encoding = "utf-8")
+    except ImportError:
+        pass
+
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd logs require python 3.14+ or the `zstandard` package.")
+
+    # each writer appends its own zstd frame, so readers must read across frames.
+    if mode == "r":
+        stream = zstandard.ZstdDecompressor().stream_reader(
+            open(path, "rb"), read_across_frames = True, closefd = True
+        )
+    else:
+        stream = zstandard.ZstdCompressor().stream_writer(
+            open(path, mode + "b"), closefd = True
+        )
+
+    return io.TextIOWrapper(stream, encoding = "utf-8")
+
+def read_log(path):
+    """
+    yields the entries in a log. a writer that was killed can leave a truncated
+    last line, or an unfinished last zstd frame, so both are skipped; a bad line
+    anywhere else is an error.
+    """
+
+    with open_log(path, "r") as log:
+        previous = None
+        try:
+            for number, line in enumerate(log, 1):
+                if previous:
+                    yield parse_entry(path, *previous)
+                previous = (number, line)
+        except EOFError:
+            # raised by `compression.zstd`; `zstandard` stops at the last whole block.
+            print(f"! skipped the unfinished end of {path}")
+
+        if previous:
+            try:
+                yield json.loads(previous[1])
+            except json.JSONDecodeError:
+                print(f"! skipped the truncated last entry of {path}")
+
+def parse_entry(path, number, line):
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as error:
+        raise ValueError(f"Unreadable entry on line {number} of {path}.") from error
+
+def serialize(value):
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+
+    return str(value)
+
+class Recorder:
+    """
+    records llm exchanges, function calls and rpcs to an append-only jsonl log.
+
+    every entry carries its kind, the id of the recorder's session, an offset
+    `t` (in seconds) from the time the recorder was created, its `duration`,
+    and the sequence number of the rpc it belongs to, so replays can match llm
+    and function calls back to their rpc even when several recorders share a
+    log. recorders in the same process share one handle per log, so their
+    lines (and zstd frames) never interleave.
+    """
+
+    # open logs, by path, along with their lock and the number of recorders using them.
+    logs = {}
+    logs_lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = str(Path(path).resolve())
+        with Recorder.logs_lock:
+            if self.path not in Recorder.logs:
+                Recorder.logs[self.path] = {
+                    "log": open_log(self.path, "a"),
+                    "lock": threading.Lock(),
+                    "users": 0
+                }
+
+            Recorder.logs[self.path]["users"] += 1
+
+        self.session = ULID().hex
+        self.local = threading.local()
+        self.sequence = itertools.count(1)
+        self.start = time.perf_counter()
+
+        self.write({
+            "kind": "session",
+            "at": datetime.now(tz = timezone.utc).isoformat()
+        })
+
+    def write(self, entry):
+        line = json.dumps(
+            { "session": self.session, **entry },
+            separators = (",", ":"), default = serialize
+        )
+
+        shared = Recorder.logs[self.path]
+        with shared["lock"]:
+            shared["log"].write(line + "\n")
+            shared["log"].flush()
+
+    def agent(self, card, model, functions):
+        self.write({
+            "kind": "agent",
+            "card": card,
+            "model": model,
+            "functions": functions
+        })
+
+    def record(self, kind, request, call):
+        """
+        runs `call` and records the request, its result (or error) and timing.
+
+        an rpc's entry also records the time spent recording the calls made
+        while handling it (`recording`), since that is part of its duration but
+        not of the server's own overhead.
+        """
+
+        began = time.perf_counter()
+
+        # snapshot the request now, since handlers mutate what they are given.
+        request = json.loads(json.dumps(request, default = serialize))
+        if kind == "rpc":
+            self.local.rpc = next(self.sequence)
+            self.local.recording = 0
+
+        entry = {
+            "kind": kind,
+            "rpc": getattr(self.local, "rpc", None),
+            "t": round(time.perf_counter() - self.start, 6)
+        }
+
+        start = time.perf_counter()
+        try:
+            entry["response"] = call()
+            return entry["response"]
+        except Exception as error:
+            entry["error"] = repr(error)
+            raise
+        finally:
+            end = time.perf_counter()
+            entry["duration"] = round(end - start, 6)
+            entry["request"] = request
+            if kind == "rpc":
+                entry["recording"] = round(self.local.recording, 6)
+                self.local.rpc = None
+
+            self.write(entry)
+            if kind != "rpc" and entry["rpc"] is not None:
+                self.local.recording += (start - began) + (time.perf_counter() - end)
+
+    def close(self):
+        with Recorder.logs_lock:
+            shared = Recorder.logs[self.path]
+            shared["users"] -= 1
+            if shared["users"] == 0:
+                with shared["lock"]:
+                    shared["log"].close()
+
+                del Recorder.logs[self.path]
@@ -0,0 +1,304 @@
+"""
+fcan/replay.py
+==============
+
+replays recorded logs against the current code, without model or network
+access, and reports latency and behavioral differences.
+"""
+
+import sys
+import json
+import time
+import argparse
+import statistics
+
+from fcan.handlers import ModelHandler
+from fcan.recorder import read_log
+
+def normalize(response):
+    """
+    copies an rpc response without the fields that legitimately differ between
+    a recording and its replay: the envelope's id, and a task's id (which is
+    remapped separately), timestamp, and message and artifact ids.
+    """
+
+    response = json.loads(json.dumps(response))
+    if not isinstance(response, dict):
+        return response
+
+    response.pop("id", None)
+    task = response.get("result")
+    if not isinstance(task, dict) or not isinstance(task.get("status"), dict):
+        return response
+
+    task.pop("id", None)
+    task["status"].pop("timestamp", None)
+    for message in [*(task.get("history") or []), task["status"].get("message")]:
+        if isinstance(message, dict):
+            message.pop("id", None)
+
+    for artifact in task.get("artifacts") or []:
+        artifact.pop("artifactId", None)
+
+    return response
+
+def load_sessions(path):
+    """
+    splits a log into sessions, one per recorder that appended to it.
+    """
+
+    sessions = {}
+    for entry in read_log(path):
+        kind = entry.get("kind")
+        if kind == "session":
+            sessions[entry["session"]] = { "agent": None, "rpcs": [], "calls": {} }
+        elif entry.get("session") not in sessions:
+            continue
+
+        session = sessions[entry["session"]]
+        if kind == "agent":
+            session["agent"] = entry
+        elif kind == "rpc":
+            session["rpcs"].append(entry)
+        elif kind != "session":
+            session["calls"].setdefault(entry.get("rpc"), []).append(entry)
+
+    # entries are written when they complete, so restore the order they began in.
+    for session in sessions.values():
+        session["rpcs"].sort(key = lambda entry: entry["t"])
+        for calls in session["calls"].values():
+            calls.sort(key = lambda entry: entry["t"])
+
+    return [session for session in sessions.values() if session["agent"]]
+
+class RecordedError(Exception):
+    """
+    re-raises an error from a recording, with the same `repr` it was recorded
+    with, so the rpc's error compares equal when the code has not changed.
+    """
+
+    def __init__(self, recorded):
+        super().__init__(recorded)
+        self.recorded = recorded
+
+    def __repr__(self):
+        return self.recorded
+
+class ReplayClient:
+    """
+    stands in for the ollama client, answering with recorded responses.
+    """
+
+    def __init__(self, replayer):
+        self.replayer = replayer
+
+    def chat(self, model, messages):
+        entry = self.replayer.next_call("chat")
+        if not entry:
+            raise Exception("No recorded model response left.")
+
+        # the system prompt embeds the current time, so it is not compared.
+        recorded = entry["request"]["messages"][1:]
+        if messages[1:] != recorded:
+            self.replayer.diff("chat messages differ from recording", recorded, messages[1:])
+
+        return self.replayer.respond(entry)
+
+class Replayer:
+    """
+    replays one recorded session through a fresh `ModelHandler`.
+    """
+
+    def __init__(self, session, pace = False):
+        self.session = session
+        self.pace = pace
+
+        agent = session["agent"]
+        card = agent["card"]
+        functions = [
+            { **spec, "function": self.replay_function(spec["name"]) }
+            for spec in agent["functions"]
+        ]
+
+        self.handler = ModelHandler(
+            card["name"], card["description"], agent["model"],
+            card["skills"], functions,
+            None, card["url"], card["version"]
+        )
+        self.handler.llm = ReplayClient(self)
+
+        self.task_ids = {}
+        self.pending, self.diffs = [], []
+        self.external = 0
+
+    def replay_function(self, name):
+        def function(**arguments):
+            entry = self.next_call("function")
+            if not entry or entry["request"]["name"] != name:
+                raise Exception(f"No recorded output for function {name}.")
+
+            if entry["request"]["arguments"] != arguments:
+                self.diff(f"arguments to {name} differ from recording", entry["request"]["arguments"], arguments)
+
+            return self.respond(entry)
+
+        return function
+
+    def next_call(self, kind):
+        if not self.pending or self.pending[0]["kind"] != kind:
+            self.diff(f"unexpected {kind} call", None, None)
+            return None
+
+        return self.pending.pop(0)
+
+    def respond(self, entry):
+        if self.pace:
+            time.sleep(entry["duration"])
+
+        self.external += entry["duration"]
+        if "error" in entry:
+            raise RecordedError(entry["error"])
+
+        return entry["response"]
+
+    def diff(self, reason, recorded, replayed):
+        self.diffs.append({ "reason": reason, "recorded": recorded, "replayed": replayed })
+
+    def map_task_ids(self, rpc):
+        params = rpc.get("params") or {}
+        for key in ["taskId", "id"]:
+            if params.get(key) in self.task_ids:
+                params[key] = self.task_ids[params[key]]
+
+        return rpc
+
+    def learn_task_ids(self, recorded, replayed):
+        recorded = (recorded or {}).get("result") or {}
+        replayed = (replayed or {}).get("result") or {}
+        if isinstance(recorded, dict) and isinstance(replayed, dict) and "status" in recorded:
+            if recorded.get("id") and replayed.get("id"):
+                self.task_ids[recorded["id"]] = replayed["id"]
+
+    def run(self):
+        """
+        replays every rpc in the session, returning one result per rpc.
+        """
+
+        results = []
+        started = time.perf_counter()
+        first = self.session["rpcs"][0]["t"] if self.session["rpcs"] else 0
+
+        for entry in self.session["rpcs"]:
+            if self.pace:
+                delay = (entry["t"] - first) - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+
+            calls = self.session["calls"].get(entry["rpc"], [])
+            self.pending, self.diffs = list(calls), []
+            self.external = 0
+
+            rpc = self.map_task_ids(json.loads(json.dumps(entry["request"])))
+            start = time.perf_counter()
+            try:
+                response, error = self.handler.process_request(rpc), None
+            except Exception as exception:
+                response, error = None, repr(exception)
+            duration = time.perf_counter() - start
+
+            # normalize through json, so tuples and the like compare as recorded.
+            response = json.loads(json.dumps(response, default = str))
+            if error != entry.get("error"):
+                self.diff("error differs from recording", entry.get("error"), error)
+            if normalize(response) != normalize(entry.get("response")):
+                self.diff("response differs from recording", entry.get("response"), response)
+            if self.pending:
+                self.diff(f"{len(self.pending)} recorded call(s) were not made", None, None)
+
+            self.learn_task_ids(entry.get("response"), response)
+            # the recorder's own cost is not part of the recorded server overhead.
+            recorded_external = sum(call["duration"] for call in calls) + entry.get("recording", 0)
+
+            results.append({
+                "rpc": entry["rpc"],
+                "method": entry["request"].get("method"),
+                "recorded": {
+                    "duration": entry["duration"],
+                    "overhead": entry["duration"] - recorded_external
+                },
+                "replayed": {
+                    "duration": duration,
+                    "overhead": duration - self.external
+                },
+                "diffs": self.diffs
+            })
+
+        return results
+
+def summarize(results):
+    """
+    summarizes the server-side overhead (time not spent in the model, in
+    functions, or recording them) of the recording and the replay, in
+    milliseconds.
+    """
+
+    def percentiles(values):
+        values = sorted(value * 1000 for value in values)
+        if not values:
+            return { "p50": 0, "p95": 0, "max": 0 }
+
+        return {
+            "p50": round(statistics.median(values), 3),
+            "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 3),
+            "max": round(values[-1], 3)
+        }
+
+    return {
+        "rpcs": len(results),
+        "diverged": sum(1 for result in results if result["diffs"]),
+        "recorded": percentiles(result["recorded"]["overhead"] for result in results),
+        "replayed": percentiles(result["replayed"]["overhead"] for result in results)
+    }
+
+def replay(path, pace = False):
+    results = []
+    for session in load_sessions(path):
+        results.extend(Replayer(session, pace).run())
+
+    return results
+
+def add_arguments(parser):
+    parser.add_argument("log", nargs = "+", help = "recorded jsonl logs (optionally .zst)")
+    parser.add_argument("--pace", action = "store_true", help = "replay at the original pacing")
+    parser.add_argument("--json", action = "store_true", help = "print the full results as json")
+
+def main(args = None):
+    parser = argparse.ArgumentParser(
+        prog = "fcan replay",
+        description = "replays recorded logs against the current code."
+    )
+    add_arguments(parser)
+    return run(parser.parse_args(args))
+
+def run(args):
+    results = []
+    for path in args.log:
+        results.extend(replay(path, args.pace))
+
+    if args.json:
+        print(json.dumps({ "summary": summarize(results), "results": results }, indent = 2))
+    else:
+        for result in results:
+            for diff in result["diffs"]:
+                print(f"! rpc {result["rpc"]} ({result["method"]}): {diff["reason"]}")
+
+        summary = summarize(results)
+        print(f"> replayed {summary["rpcs"]} rpcs, {summary["diverged"]} diverged")
+        for kind in ["recorded", "replayed"]:
+            stats = summary[kind]
+            print(f"i {kind} overhead (ms): p50 {stats["p50"]}, p95 {stats["p95"]}, max {stats["max"]}")
+
+    return 1 if any(result["diffs"] for result in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,11 +8,9 @@ provides a json-rpc http server to handle a2a methods.
 import traceback
 import logging
 import threading
-import flask.cli
-
-from flask import Flask, request, jsonify
 
 from fcan.handlers import ModelHandler
+from fcan.recorder import Recorder
 
 class A2AServer:
     """
@@ -23,21 +21,31 @@ class A2AServer:
         self,
         name, description, model, skills, functions,
         host = "0.0.0.0", port = 11420,
-        ollama_url = "http://localhost:11434"
+        ollama_url = "http://localhost:11434",
+        record = None
     ):
         self.host, self.port = host, port
         self.endpoint = f"http://{host}:{port}"
 
+        # flask is imported here rather than at the top, to keep `import fcan` cheap.
+        from flask import Flask
+
         self.app = Flask(__name__)
+        self.server = None
+        self.recorder = Recorder(record) if record else None
         self.model_handler = ModelHandler(
             name, description, model,
             skills, functions,
-            ollama_url, self.endpoint
+            ollama_url, self.endpoint,
+            recorder = self.recorder
         )
 
         self.setup()
 
     def setup(self):
+        import flask.cli
+        from flask import request, jsonify
+
         self.app.logger.disabled = True
         logging.getLogger('werkzeug').disabled = True
         flask.cli.show_server_banner = lambda *args: None
@@ -60,5 +68,24 @@ class A2AServer:
                 return jsonify({ "code": -32603, "message": "Internal error." })
 
     def start(self):
+        from werkzeug.serving import make_server
+
+        # bind before returning, so errors like a port in use reach the caller.
+        # werkzeug prints why it could not bind and exits, so turn that into an error.
+        try:
+            self.server = make_server(self.host, self.port, self.app, threaded = True)
+        except SystemExit:
+            raise OSError(f"Cannot bind to port {self.port} on {self.host}.")
+        threading.Thread(target = self.server.serve_forever, daemon = True).start()
         print(f"> listening for rpc calls at port {self.port} on {self.host}")
-        threading.Thread(target = self.app.run, args = (self.host, self.port), daemon = True).start()
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+        # closing the recorder ends a compressed log's zstd frame.
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
@@ -0,0 +1,44 @@
+import sys
+import json
+import pytest
+
+from fcan.cli import main
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """
+    writes a config (and the module its functions come from) with an agent on
+    a free port, returning its path.
+    """
+
+    # `fcan serve` puts the config's directory on the path.
+    monkeypatch.setattr(sys, "path", list(sys.path))
+
+    module = f"tools_{tmp_path.name}"
+    (tmp_path / f"{module}.py").write_text("def add(numbers):\n    return sum(numbers)\n")
+
+    def write(function = "add", **agent):
+        path = tmp_path / "agents.json"
+        path.write_text(json.dumps({
+            "model": "model",
+            "agents": [{
+                "name": "Agent", "description": "Adds numbers.", "port": 0,
+                "functions": [{ "name": "add", "description": "Adds numbers.", "function": f"{module}:{function}" }],
+                **agent
+            }]
+        }))
+
+        return str(path)
+
+    return write
+
+def test_check_succeeds_for_a_valid_config(config):
+    assert main(["serve", config(), "--check"]) == 0
+
+def test_check_fails_on_a_bad_import_path(config, capsys):
+    assert main(["serve", config(function = "missing"), "--check"]) == 1
+    assert "! cannot load function add" in capsys.readouterr().out
+
+def test_serve_reports_agents_it_cannot_create(config, capsys):
+    assert main(["serve", config(colour = "blue"), "--check"]) == 1
+    assert "! failed to create agent Agent" in capsys.readouterr().out
@@ -0,0 +1,94 @@
+import json
+import pytest
+
+from fcan import config
+from fcan.config import LazyFunction, load_config
+
+def write_config(path, content):
+    path.write_text(json.dumps(content))
+    return path
+
+def test_top_level_keys_are_defaults(tmp_path):
+    path = write_config(tmp_path / "agents.json", {
+        "model": "gemma3",
+        "port": 11420,
+        "agents": [
+            { "name": "First" },
+            { "name": "Second", "port": 11421 }
+        ]
+    })
+
+    first, second = load_config(path)
+    assert (first["model"], first["port"]) == ("gemma3", 11420)
+    assert (second["model"], second["port"]) == ("gemma3", 11421)
+    assert first["skills"] == [] and first["functions"] == []
+
+def test_record_paths_are_relative_to_the_config(tmp_path):
+    path = write_config(tmp_path / "agents.json", {
+        "agents": [{ "name": "First", "record": "logs/first.jsonl" }]
+    })
+
+    [agent] = load_config(path)
+    assert agent["record"] == str(tmp_path / "logs" / "first.jsonl")
+
+def test_a_shared_record_path_gets_each_agents_name(tmp_path):
+    path = write_config(tmp_path / "agents.json", {
+        "record": "logs/calls.jsonl.zst",
+        "agents": [
+            { "name": "Weather Agent" },
+            { "name": "Maths  (v2)" },
+            { "name": "Own", "record": "own.jsonl" }
+        ]
+    })
+
+    weather, maths, own = load_config(path)
+    assert weather["record"] == str(tmp_path / "logs" / "calls-weather-agent.jsonl.zst")
+    assert maths["record"] == str(tmp_path / "logs" / "calls-maths-v2.jsonl.zst")
+    assert own["record"] == str(tmp_path / "own.jsonl")
+
+def test_toml_configs_are_read(tmp_path):
+    path = tmp_path / "agents.toml"
+    path.write_text('model = "gemma3"\n\n[[agents]]\nname = "First"\n')
+
+    [agent] = load_config(path)
+    assert (agent["name"], agent["model"]) == ("First", "gemma3")
+
+def test_functions_need_an_import_path(tmp_path):
+    path = write_config(tmp_path / "agents.json", {
+        "agents": [{ "name": "First", "functions": [{ "name": "add" }] }]
+    })
+
+    with pytest.raises(ValueError, match = "add"):
+        load_config(path)
+
+def test_functions_are_loaded_lazily(tmp_path):
+    path = write_config(tmp_path / "agents.json", {
+        "agents": [{ "name": "First", "functions": [{ "name": "add", "function": "missing_module:add" }] }]
+    })
+
+    [agent] = load_config(path)
+    [spec] = agent["functions"]
+    assert isinstance(spec["function"], LazyFunction)
+    assert spec["function"].path == "missing_module:add"
+
+@pytest.mark.parametrize("path", ["operator", "operator:", ":add"])
+def test_lazy_functions_need_a_module_and_attribute(path):
+    with pytest.raises(ValueError):
+        LazyFunction(path)
+
+def test_lazy_functions_resolve_dotted_attributes_once(monkeypatch):
+    imports = []
+    import_module = config.importlib.import_module
+
+    def counting_import(name):
+        imports.append(name)
+        return import_module(name)
+
+    monkeypatch.setattr(config.importlib, "import_module", counting_import)
+
+    function = LazyFunction("pathlib:PurePosixPath.joinpath")
+    assert imports == []
+
+    assert str(function(config.Path("a"), "b")) == "a/b"
+    assert str(function(config.Path("c"), "d")) == "c/d"
+    assert imports == ["pathlib"]
@@ -0,0 +1,146 @@
+import pytest
+
+from fcan.handlers import ModelHandler, TaskHandler
+from fcan.recorder import Recorder, read_log
+from fcan.replay import replay, main
+
+class FailingModel:
+    def __init__(self, responses):
+        self.responses = iter(responses)
+
+    def chat(self, model, messages):
+        response = next(self.responses)
+        if isinstance(response, Exception):
+            raise response
+
+        return { "message": { "role": "assistant", "content": response } }
+
+class Model:
+    def __init__(self, response):
+        self.response = response
+
+    def chat(self, model, messages):
+        return { "message": { "role": "assistant", "content": self.response } }
+
+def add(numbers):
+    return sum(numbers)
+
+def divide(numbers):
+    raise ValueError("cannot divide")
+
+def message(text, task_id = None):
+    params = { "message": { "role": "user", "parts": [{ "kind": "text", "text": text }] } }
+    if task_id:
+        params["taskId"] = task_id
+
+    return { "jsonrpc": "2.0", "id": "1", "method": "message/send", "params": params }
+
+def record_conversation(path):
+    """
+    records a function call, a multi-turn task and a `tasks/get`, returning
+    the responses.
+    """
+
+    recorder = Recorder(path)
+    handler = ModelHandler(
+        "Agent", "Adds numbers.", "model", [{ "id": "adding" }],
+        [{ "name": "add", "description": "Adds numbers.", "parameters": {}, "function": add }],
+        None, "http://localhost:11420", recorder = recorder
+    )
+    handler.llm = FailingModel([
+        '{ "function": "add", "arguments": { "numbers": [1, 2] } }',
+        '{ "response": "3", "artifacts": [[{ "kind": "data", "content": { "id": 3 } }]] }',
+        '{ "interrupt": "input", "message": "What should I add?" }',
+        '{ "response": "Nothing to add." }'
+    ])
+
+    added = handler.process_request(message("Add 1 and 2."))
+    asked = handler.process_request(message("Add some numbers."))
+    answered = handler.process_request(message("Nothing.", asked["result"]["id"]))
+    fetched = handler.process_request({
+        "jsonrpc": "2.0", "id": "2", "method": "tasks/get",
+        "params": { "id": added["result"]["id"] }
+    })
+
+    recorder.close()
+    return added, asked, answered, fetched
+
+def test_replaying_a_recording_does_not_diverge(tmp_path):
+    path = tmp_path / "log.jsonl"
+    added, asked, answered, fetched = record_conversation(path)
+    assert answered["result"]["status"]["state"] == "completed"
+    assert fetched["result"]["status"]["state"] == "completed"
+
+    results = replay(path)
+    assert [result["method"] for result in results] == ["message/send"] * 3 + ["tasks/get"]
+    assert [result["diffs"] for result in results] == [[], [], [], []]
+    assert main([str(path)]) == 0
+
+def test_changed_responses_are_reported(tmp_path, monkeypatch):
+    path = tmp_path / "log.jsonl"
+    record_conversation(path)
+
+    monkeypatch.setattr(TaskHandler, "get_conversation_for_task", lambda self, task_id: [])
+
+    results = replay(path)
+    reasons = [diff["reason"] for result in results for diff in result["diffs"]]
+    assert "response differs from recording" in reasons
+    assert main([str(path)]) == 1
+
+def test_replaying_recorded_errors_does_not_diverge(tmp_path):
+    path = tmp_path / "log.jsonl"
+    recorder = Recorder(path)
+
+    handler = ModelHandler(
+        "Agent", "Divides numbers.", "model", [],
+        [{ "name": "divide", "description": "Divides numbers.", "parameters": {}, "function": divide }],
+        None, "http://localhost:11420", recorder = recorder
+    )
+    handler.llm = FailingModel([
+        ConnectionError("ollama down"),
+        '{ "function": "divide", "arguments": { "numbers": [1, 0] } }'
+    ])
+
+    for text in ["first", "second"]:
+        try:
+            handler.process_request(message(text))
+        except Exception:
+            pass
+
+    recorder.close()
+
+    results = replay(path)
+    assert len(results) == 2
+    assert [result["diffs"] for result in results] == [[], []]
+
+def test_recorders_sharing_a_log_replay_separately(tmp_path):
+    path = tmp_path / "log.jsonl"
+    recorders, handlers = [], []
+
+    for name, response in [("First", '{ "response": "one" }'), ("Second", '{ "response": "two" }')]:
+        recorder = Recorder(path)
+        handler = ModelHandler(name, "Answers.", "model", [], [], None, "http://localhost:11420", recorder = recorder)
+        handler.llm = Model(response)
+
+        recorders.append(recorder)
+        handlers.append(handler)
+
+    for handler in handlers:
+        handler.process_request(message("hello"))
+
+    for recorder in recorders:
+        recorder.close()
+
+    results = replay(path)
+    assert len(results) == 2
+    assert [result["diffs"] for result in results] == [[], []]
+
+def test_only_a_truncated_last_entry_is_skipped(tmp_path):
+    path = tmp_path / "log.jsonl"
+
+    path.write_text('{ "n": 1 }\n{ "n": 2 }\n{ "n"')
+    assert list(read_log(path)) == [{ "n": 1 }, { "n": 2 }]
+
+    path.write_text('{ "n": 1 }\n{ "n"\n{ "n": 3 }\n')
+    with pytest.raises(ValueError):
+        list(read_log(path))